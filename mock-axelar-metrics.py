@@ -4,82 +4,58 @@ Mock Axelar node that serves Prometheus metrics for ARM64 testing
 This simulates the key metrics that would be available from a real Axelar node
 """
 
+import functools
 import http.server
-import socketserver
+import threading
 import time
 import random
-from urllib.parse import urlparse
 
-class MockAxelarHandler(http.server.BaseHTTPRequestHandler):
-    def do_GET(self):
-        parsed_path = urlparse(self.path)
-        
-        if parsed_path.path == '/health':
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.end_headers()
-            health_response = '{"status": "ok", "height": "12345", "catching_up": false}'
-            self.wfile.write(health_response.encode())
-            
-        elif parsed_path.path == '/status':
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.end_headers()
-            status_response = '''
-            {
-                "jsonrpc": "2.0",
-                "id": "",
-                "result": {
-                    "node_info": {
-                        "protocol_version": {"p2p": "8", "block": "11", "app": "0"},
-                        "id": "mock-node-id",
-                        "listen_addr": "tcp://0.0.0.0:26656",
-                        "network": "axelar-testnet-lisbon-3",
-                        "version": "v0.35.5",
-                        "channels": "40202122233038606100",
-                        "moniker": "mock-axelar-node",
-                        "other": {"tx_index": "on", "rpc_address": "tcp://0.0.0.0:26657"}
-                    },
-                    "sync_info": {
-                        "latest_block_hash": "mock-hash",
-                        "latest_app_hash": "mock-app-hash",
-                        "latest_block_height": "12345",
-                        "latest_block_time": "2025-01-28T09:00:00.000Z",
-                        "earliest_block_hash": "mock-early-hash",
-                        "earliest_app_hash": "mock-early-app-hash",
-                        "earliest_block_height": "1",
-                        "earliest_block_time": "2024-01-01T00:00:00.000Z",
-                        "catching_up": false
-                    },
-                    "validator_info": {
-                        "address": "mock-validator-address",
-                        "pub_key": {"type": "tendermint/PubKeyEd25519", "value": "mock-pubkey"},
-                        "voting_power": "0"
-                    }
-                }
-            }
-            '''
-            self.wfile.write(status_response.encode())
-            
-        elif parsed_path.path == '/metrics':
-            self.send_response(200)
-            self.send_header('Content-type', 'text/plain')
-            self.end_headers()
-            
-            # Generate mock Prometheus metrics similar to what Axelar would provide
-            current_time = int(time.time())
-            block_height = 12345 + int(time.time()) % 100  # Simulate increasing block height
-            peer_count = random.randint(8, 15)
-            memory_usage = random.randint(2000000000, 4000000000)  # 2-4GB in bytes
-            cpu_usage = random.uniform(0.1, 0.8)
-            
-            metrics = f'''# HELP tendermint_consensus_height Height of the chain
+# /health and /status never change, so their bodies are encoded once.
+_HEALTH_BODY = b'{"status": "ok", "height": "12345", "catching_up": false}'
+
+_STATUS_BODY = b'''{
+    "jsonrpc": "2.0",
+    "id": "",
+    "result": {
+        "node_info": {
+            "protocol_version": {"p2p": "8", "block": "11", "app": "0"},
+            "id": "mock-node-id",
+            "listen_addr": "tcp://0.0.0.0:26656",
+            "network": "axelar-testnet-lisbon-3",
+            "version": "v0.35.5",
+            "channels": "40202122233038606100",
+            "moniker": "mock-axelar-node",
+            "other": {"tx_index": "on", "rpc_address": "tcp://0.0.0.0:26657"}
+        },
+        "sync_info": {
+            "latest_block_hash": "mock-hash",
+            "latest_app_hash": "mock-app-hash",
+            "latest_block_height": "12345",
+            "latest_block_time": "2025-01-28T09:00:00.000Z",
+            "earliest_block_hash": "mock-early-hash",
+            "earliest_app_hash": "mock-early-app-hash",
+            "earliest_block_height": "1",
+            "earliest_block_time": "2024-01-01T00:00:00.000Z",
+            "catching_up": false
+        },
+        "validator_info": {
+            "address": "mock-validator-address",
+            "pub_key": {"type": "tendermint/PubKeyEd25519", "value": "mock-pubkey"},
+            "voting_power": "0"
+        }
+    }
+}
+'''
+
+# Static Prometheus exposition body; each {slot} marker is filled per request
+# with a dynamic value, in the order the values are produced in _serve_metrics.
+_METRICS_TEMPLATE = b'''# HELP tendermint_consensus_height Height of the chain
 # TYPE tendermint_consensus_height gauge
-tendermint_consensus_height {block_height}
+tendermint_consensus_height {slot}
 
 # HELP tendermint_p2p_peers Number of peers
 # TYPE tendermint_p2p_peers gauge
-tendermint_p2p_peers {peer_count}
+tendermint_p2p_peers {slot}
 
 # HELP tendermint_consensus_validators Number of validators
 # TYPE tendermint_consensus_validators gauge
@@ -91,7 +67,7 @@ tendermint_consensus_validator_power 0
 
 # HELP tendermint_consensus_validator_last_signed_height Last height signed by validator
 # TYPE tendermint_consensus_validator_last_signed_height gauge
-tendermint_consensus_validator_last_signed_height {block_height - 1}
+tendermint_consensus_validator_last_signed_height {slot}
 
 # HELP tendermint_consensus_validator_missed_blocks Number of missed blocks
 # TYPE tendermint_consensus_validator_missed_blocks counter
@@ -99,41 +75,41 @@ tendermint_consensus_validator_missed_blocks 0
 
 # HELP tendermint_consensus_block_interval_seconds Time between blocks
 # TYPE tendermint_consensus_block_interval_seconds histogram
-tendermint_consensus_block_interval_seconds_bucket{{le="1"}} 0
-tendermint_consensus_block_interval_seconds_bucket{{le="2"}} 45
-tendermint_consensus_block_interval_seconds_bucket{{le="5"}} 120
-tendermint_consensus_block_interval_seconds_bucket{{le="10"}} 150
-tendermint_consensus_block_interval_seconds_bucket{{le="+Inf"}} 150
+tendermint_consensus_block_interval_seconds_bucket{le="1"} 0
+tendermint_consensus_block_interval_seconds_bucket{le="2"} 45
+tendermint_consensus_block_interval_seconds_bucket{le="5"} 120
+tendermint_consensus_block_interval_seconds_bucket{le="10"} 150
+tendermint_consensus_block_interval_seconds_bucket{le="+Inf"} 150
 tendermint_consensus_block_interval_seconds_sum 450.5
 tendermint_consensus_block_interval_seconds_count 150
 
 # HELP tendermint_mempool_size Number of transactions in mempool
 # TYPE tendermint_mempool_size gauge
-tendermint_mempool_size {random.randint(0, 50)}
+tendermint_mempool_size {slot}
 
 # HELP tendermint_p2p_peer_receive_bytes_total Bytes received from peers
 # TYPE tendermint_p2p_peer_receive_bytes_total counter
-tendermint_p2p_peer_receive_bytes_total {random.randint(1000000, 10000000)}
+tendermint_p2p_peer_receive_bytes_total {slot}
 
 # HELP tendermint_p2p_peer_send_bytes_total Bytes sent to peers
 # TYPE tendermint_p2p_peer_send_bytes_total counter
-tendermint_p2p_peer_send_bytes_total {random.randint(1000000, 10000000)}
+tendermint_p2p_peer_send_bytes_total {slot}
 
 # HELP process_resident_memory_bytes Resident memory size in bytes
 # TYPE process_resident_memory_bytes gauge
-process_resident_memory_bytes {memory_usage}
+process_resident_memory_bytes {slot}
 
 # HELP process_cpu_seconds_total Total user and system CPU time spent in seconds
 # TYPE process_cpu_seconds_total counter
-process_cpu_seconds_total {cpu_usage * current_time}
+process_cpu_seconds_total {slot}
 
 # HELP go_memstats_alloc_bytes Number of bytes allocated and still in use
 # TYPE go_memstats_alloc_bytes gauge
-go_memstats_alloc_bytes {random.randint(50000000, 200000000)}
+go_memstats_alloc_bytes {slot}
 
 # HELP go_goroutines Number of goroutines that currently exist
 # TYPE go_goroutines gauge
-go_goroutines {random.randint(100, 500)}
+go_goroutines {slot}
 
 # HELP axelar_vote_events_total Total number of vote events
 # TYPE axelar_vote_events_total counter
@@ -151,15 +127,227 @@ axelar_key_assignments_total 42
 # TYPE axelar_sign_attempts_total counter
 axelar_sign_attempts_total 987
 '''
-            self.wfile.write(metrics.encode())
-            
+
+# Inclusive (low, high) bounds for the randomized gauges, in the order they
+# are unpacked in _serve_metrics, stored as (low, span) so each draw is a
+# single multiply instead of a randint() call with its argument checks.
+_RNG = random.Random()
+_RANDOM_SPANS = tuple((low, high - low + 1) for low, high in (
+    (8, 15),                     # peer_count
+    (0, 50),                     # mempool size
+    (1000000, 10000000),         # bytes received
+    (1000000, 10000000),         # bytes sent
+    (2000000000, 4000000000),    # resident memory, 2-4GB in bytes
+    (50000000, 200000000),       # go heap alloc
+    (100, 500),                  # goroutines
+))
+
+def _fixed_width_encoder(width, table_size=0):
+    """Return a function encoding an int as exactly ``width`` zero-padded digits.
+
+    With ``table_size``, values below it are looked up from pre-encoded bytes.
+    """
+    fmt = b'%%0%dd' % width
+    if table_size:
+        return tuple(fmt % n for n in range(table_size)).__getitem__
+    return fmt.__mod__
+
+# One encoder per {slot} marker in _METRICS_TEMPLATE, in template order. Each
+# slot is as wide as the largest value it can hold, so the body has a fixed
+# layout (Prometheus parses the leading zeros of shorter values). The small
+# gauges come from lookup tables and block heights, which only drift through
+# ~100 values, from an LRU; the byte and memory counters are effectively
+# unique per scrape, so they are formatted directly.
+_encode_height = functools.lru_cache(maxsize=1024)(_fixed_width_encoder(5))
+_SLOT_ENCODERS = (
+    _encode_height,                 # consensus height
+    _fixed_width_encoder(2, 16),    # peers
+    _encode_height,                 # validator last signed height
+    _fixed_width_encoder(2, 51),    # mempool size
+    _fixed_width_encoder(8),        # bytes received
+    _fixed_width_encoder(8),        # bytes sent
+    _fixed_width_encoder(10),       # resident memory
+    _fixed_width_encoder(10),       # CPU seconds
+    _fixed_width_encoder(9),        # go heap alloc
+    _fixed_width_encoder(3, 501),   # goroutines
+)
+
+def _layout_metrics_body():
+    """Lay the template out with zeroed slots; return the body and slot spans"""
+    parts = _METRICS_TEMPLATE.split(b'{slot}')
+    body = bytearray(parts[0])
+    spans = []
+    for encode, static in zip(_SLOT_ENCODERS, parts[1:]):
+        start = len(body)
+        body += encode(0)
+        spans.append((start, len(body)))
+        body += static
+    return bytes(body), tuple(spans)
+
+_METRICS_BODY, _SLOT_SPANS = _layout_metrics_body()
+
+def fill_metrics_body(buf, values):
+    """Write one tuple of dynamic values into ``buf``, a copy of _METRICS_BODY.
+
+    ``values`` must hold one integer per ``{slot}`` marker in
+    _METRICS_TEMPLATE, in template order, each within its slot's width. If
+    one overflows, ``buf`` is reset to the template so it stays reusable.
+    """
+    for value, encode, (start, end) in zip(values, _SLOT_ENCODERS, _SLOT_SPANS):
+        buf[start:end] = encode(value)
+    if len(buf) != len(_METRICS_BODY):
+        buf[:] = _METRICS_BODY
+        raise ValueError("metric value does not fit its fixed-width slot")
+
+# Per-thread /metrics body. Every slot is rewritten on each scrape and the
+# static text never changes, so a handler thread (one per connection) reuses
+# its buffer across keep-alive requests instead of copying the template.
+_TLS = threading.local()
+
+def _metrics_buffer():
+    buf = getattr(_TLS, 'metrics_body', None)
+    if buf is None:
+        buf = _TLS.metrics_body = bytearray(_METRICS_BODY)
+    return buf
+
+# Status line and Content-Type for each kind of response never change, so
+# they are kept pre-rendered; only Content-Length and Connection vary.
+_JSON_HEADERS = b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+_METRICS_HEADERS = b"HTTP/1.1 200 OK\r\nContent-Type: text/plain; version=0.0.4\r\n"
+_NOT_FOUND_HEADERS = b"HTTP/1.1 404 Not Found\r\nContent-Type: text/plain\r\n"
+
+def _send_all(sock, buffers):
+    """Like sock.sendall(), but for a list of buffers.
+
+    Uses sendmsg() (writev) so the buffers go out without being copied into
+    one contiguous bytes object, looping on partial sends.
+    """
+    if not hasattr(sock, 'sendmsg'):
+        sock.sendall(b"".join(buffers))
+        return
+
+    buffers = list(buffers)
+    while buffers:
+        sent = sock.sendmsg(buffers)
+        while buffers and sent >= len(buffers[0]):
+            sent -= len(buffers.pop(0))
+        if sent:
+            buffers[0] = memoryview(buffers[0])[sent:]
+
+def _write_response(handler, code, headers, *parts):
+    """Send pre-rendered ``headers`` and the body ``parts`` in one system call.
+
+    send_response()/send_header()/end_headers() followed by a body write
+    costs several writes per request, plus a Date header strftime, so the
+    response is assembled directly instead. wfile is unbuffered, so writing
+    to the socket directly cannot reorder output.
+    """
+    length = sum(map(len, parts))
+    handler.log_request(code, length)
+    _send_all(handler.connection, (
+        b"%sContent-Length: %d\r\nConnection: %s\r\n\r\n" % (
+            headers,
+            length,
+            b'close' if handler.close_connection else b'keep-alive',
+        ),
+        *parts,
+    ))
+
+def _serve_health(handler):
+    _write_response(handler, 200, _JSON_HEADERS, _HEALTH_BODY)
+
+def _serve_status(handler):
+    _write_response(handler, 200, _JSON_HEADERS, _STATUS_BODY)
+
+def _serve_metrics(handler):
+    # Generate mock Prometheus metrics similar to what Axelar would provide
+    now = time.time()
+    block_height = 12345 + int(now) % 100  # Simulate increasing block height
+    draw = _RNG.random
+    peer_count, mempool, rx, tx, memory_usage, alloc, goroutines = [
+        low + int(draw() * span) for low, span in _RANDOM_SPANS
+    ]
+    cpu_usage = 0.1 + 0.7 * draw()
+
+    values = (
+        block_height,
+        peer_count,
+        block_height - 1,
+        mempool,
+        rx,
+        tx,
+        memory_usage,
+        int(cpu_usage * now),
+        alloc,
+        goroutines,
+    )
+    body = _metrics_buffer()
+    fill_metrics_body(body, values)
+    _write_response(handler, 200, _METRICS_HEADERS, body)
+
+# Most traffic is Prometheus scraping /metrics; one dict lookup replaces the
+# per-request chain of path comparisons.
+_ROUTES = {
+    '/metrics': _serve_metrics,
+    '/health': _serve_health,
+    '/status': _serve_status,
+}
+
+# (epoch second, formatted timestamp) of the last log line, swapped as one
+# tuple so threads never see a second paired with another second's text.
+_LAST_STAMP = [(0, '')]
+
+def _timestamp():
+    """Return the local time as '%Y-%m-%d %H:%M:%S', formatting once per second"""
+    now = int(time.time())
+    second, stamp = _LAST_STAMP[0]
+    if now != second:
+        stamp = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(now))
+        _LAST_STAMP[0] = (now, stamp)
+    return stamp
+
+# Requests served since startup. Incremented without a lock, so concurrent
+# handler threads may occasionally drop a count; it only feeds the periodic
+# log line below.
+_REQ_COUNT = [0]
+
+def _report_requests(interval=5):
+    """Print how many requests were served every ``interval`` seconds"""
+    last = 0
+    while True:
+        time.sleep(interval)
+        total = _REQ_COUNT[0]
+        if total != last:
+            print(f"[{_timestamp()}] Served {total - last} "
+                  f"requests in the last {interval}s ({total} total)", flush=True)
+            last = total
+
+class MockAxelarHandler(http.server.BaseHTTPRequestHandler):
+    # HTTP/1.1 keeps the connection open between requests, so a Prometheus
+    # server scraping repeatedly reuses one TCP connection. Every response
+    # carries a Content-Length, which persistent connections require.
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        path = self.path
+        query = path.find('?')
+        if query >= 0:
+            path = path[:query]
+
+        route = _ROUTES.get(path)
+        if route is not None:
+            route(self)
         else:
-            self.send_response(404)
-            self.end_headers()
-            self.wfile.write(b'Not Found')
+            _write_response(self, 404, _NOT_FOUND_HEADERS, b'Not Found')
+
+    def log_request(self, code='-', size='-'):
+        # Per-request log lines cost a strftime and a contended stdout write
+        # on every scrape; count requests instead and let _report_requests()
+        # summarise them. Errors still go through log_message().
+        _REQ_COUNT[0] += 1
 
     def log_message(self, format, *args):
-        print(f"[{time.strftime('%Y-%m-%d %H:%M:%S')}] {format % args}")
+        print(f"[{_timestamp()}] {format % args}")
 
 if __name__ == "__main__":
     PORT = 26660
@@ -169,8 +357,12 @@ if __name__ == "__main__":
     print(f"  Status: http://localhost:{PORT}/status") 
     print(f"  Metrics: http://localhost:{PORT}/metrics")
     
-    with socketserver.TCPServer(("", PORT), MockAxelarHandler) as httpd:
+    # Serve each connection on its own thread so parallel Prometheus scrapes,
+    # and idle keep-alive connections, do not block one another.
+    # ThreadingHTTPServer already sets allow_reuse_address and daemon_threads.
+    with http.server.ThreadingHTTPServer(("", PORT), MockAxelarHandler) as httpd:
         print(f"Mock Axelar node serving at port {PORT}")
+        threading.Thread(target=_report_requests, daemon=True).start()
         try:
             httpd.serve_forever()
         except KeyboardInterrupt:
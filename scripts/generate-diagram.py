@@ -3,119 +3,178 @@
 Generate Axelar Kubernetes Architecture Diagram
 """
 
+import hashlib
+import importlib
 import os
-from diagrams import Diagram, Cluster, Edge
-from diagrams.k8s.compute import Deployment, Pod, ReplicaSet
-from diagrams.k8s.network import Service, Ingress
-from diagrams.k8s.storage import PersistentVolume, PersistentVolumeClaim
-from diagrams.k8s.rbac import ServiceAccount, ClusterRole
-from diagrams.k8s.others import CRD
-from diagrams.onprem.gitops import ArgoCD
-from diagrams.onprem.monitoring import Prometheus, Grafana
-from diagrams.programming.language import Go
-from diagrams.generic.blank import Blank
+import shutil
+from concurrent.futures import ProcessPoolExecutor
 
-def generate_architecture_diagram():
-    """Generate the main architecture diagram"""
-    
-    # Ensure diagrams directory exists
-    os.makedirs("diagrams", exist_ok=True)
-    
-    with Diagram("Axelar Kubernetes Architecture", 
-                 filename="diagrams/axelar-architecture-diagram",
-                 show=False,
-                 direction="TB"):
-        
+CACHE_DIR = "diagrams/.cache"
+
+# Node types referenced by name from the diagram specs below, mapped to the
+# diagrams module that defines them. They are imported on first render, so
+# importing this script (e.g. from tooling) does not load diagrams' icon
+# packages.
+NODE_TYPES = {
+    "ArgoCD": "diagrams.onprem.gitops",
+    "Blank": "diagrams.generic.blank",
+    "CRD": "diagrams.k8s.others",
+    "Deployment": "diagrams.k8s.compute",
+    "Go": "diagrams.programming.language",
+    "Grafana": "diagrams.onprem.monitoring",
+    "PersistentVolumeClaim": "diagrams.k8s.storage",
+    "Prometheus": "diagrams.onprem.monitoring",
+    "Service": "diagrams.k8s.network",
+    "ServiceAccount": "diagrams.k8s.rbac",
+}
+
+# Each node is (key, node type, label, cluster path); edges connect node keys.
+ARCHITECTURE_DIAGRAM = {
+    "name": "Axelar Kubernetes Architecture",
+    "filename": "diagrams/axelar-architecture-diagram",
+    "direction": "TB",
+    "nodes": [
         # GitOps Layer
-        with Cluster("GitOps Layer"):
-            argocd = ArgoCD("ArgoCD")
-            git_repo = Blank("Git Repository")
-            
+        ("argocd", "ArgoCD", "ArgoCD", ("GitOps Layer",)),
+        ("git_repo", "Blank", "Git Repository", ("GitOps Layer",)),
         # Operator Layer
-        with Cluster("Operator Layer"):
-            operator = Deployment("Axelar Operator")
-            crds = CRD("AxelarNode CRD")
-            rbac = ServiceAccount("RBAC")
-            
+        ("operator", "Deployment", "Axelar Operator", ("Operator Layer",)),
+        ("crds", "CRD", "AxelarNode CRD", ("Operator Layer",)),
+        ("rbac", "ServiceAccount", "RBAC", ("Operator Layer",)),
         # Application Layer
-        with Cluster("Axelar Testnet"):
-            with Cluster("Node Components"):
-                axelar_node = Deployment("Axelar Node")
-                node_service = Service("Node Service")
-                node_pvc = PersistentVolumeClaim("Node Data")
-                
-        with Cluster("Axelar Mainnet"):
-            with Cluster("Validator Components"):
-                validator = Deployment("Validator")
-                validator_service = Service("Validator Service")
-                validator_pvc = PersistentVolumeClaim("Validator Data")
-                
+        ("axelar_node", "Deployment", "Axelar Node", ("Axelar Testnet", "Node Components")),
+        ("node_service", "Service", "Node Service", ("Axelar Testnet", "Node Components")),
+        ("node_pvc", "PersistentVolumeClaim", "Node Data", ("Axelar Testnet", "Node Components")),
+        ("validator", "Deployment", "Validator", ("Axelar Mainnet", "Validator Components")),
+        ("validator_service", "Service", "Validator Service", ("Axelar Mainnet", "Validator Components")),
+        ("validator_pvc", "PersistentVolumeClaim", "Validator Data", ("Axelar Mainnet", "Validator Components")),
         # Monitoring Layer
-        with Cluster("Monitoring"):
-            prometheus = Prometheus("Prometheus")
-            grafana = Grafana("Grafana")
-            
-        # Connections
-        git_repo >> argocd
-        argocd >> operator
-        argocd >> axelar_node
-        argocd >> validator
-        
-        operator >> crds
-        rbac >> operator
-        
-        axelar_node >> node_service
-        axelar_node >> node_pvc
-        
-        validator >> validator_service
-        validator >> validator_pvc
-        
-        node_service >> prometheus
-        validator_service >> prometheus
-        prometheus >> grafana
+        ("prometheus", "Prometheus", "Prometheus", ("Monitoring",)),
+        ("grafana", "Grafana", "Grafana", ("Monitoring",)),
+    ],
+    "edges": [
+        ("git_repo", "argocd"),
+        ("argocd", "operator"),
+        ("argocd", "axelar_node"),
+        ("argocd", "validator"),
+        ("operator", "crds"),
+        ("rbac", "operator"),
+        ("axelar_node", "node_service"),
+        ("axelar_node", "node_pvc"),
+        ("validator", "validator_service"),
+        ("validator", "validator_pvc"),
+        ("node_service", "prometheus"),
+        ("validator_service", "prometheus"),
+        ("prometheus", "grafana"),
+    ],
+}
 
-def generate_operator_workflow_diagram():
-    """Generate operator workflow diagram"""
-    
-    with Diagram("Axelar Operator Workflow",
-                 filename="diagrams/operator-workflow-diagram", 
-                 show=False,
-                 direction="LR"):
-        
+OPERATOR_WORKFLOW_DIAGRAM = {
+    "name": "Axelar Operator Workflow",
+    "filename": "diagrams/operator-workflow-diagram",
+    "direction": "LR",
+    "nodes": [
         # User creates AxelarNode
-        user = Blank("User")
-        axelar_node_cr = CRD("AxelarNode CR")
-        
+        ("user", "Blank", "User", ()),
+        ("axelar_node_cr", "CRD", "AxelarNode CR", ()),
         # Operator processes
-        operator = Go("Axelar Operator")
-        
+        ("operator", "Go", "Axelar Operator", ()),
         # Generated resources
-        with Cluster("Generated Resources"):
-            deployment = Deployment("Node Deployment")
-            service = Service("Node Service")
-            pvc = PersistentVolumeClaim("Storage")
-            configmap = Blank("ConfigMap")
-            
-        # Connections
-        user >> axelar_node_cr
-        axelar_node_cr >> operator
-        operator >> deployment
-        operator >> service
-        operator >> pvc
-        operator >> configmap
+        ("deployment", "Deployment", "Node Deployment", ("Generated Resources",)),
+        ("service", "Service", "Node Service", ("Generated Resources",)),
+        ("pvc", "PersistentVolumeClaim", "Storage", ("Generated Resources",)),
+        ("configmap", "Blank", "ConfigMap", ("Generated Resources",)),
+    ],
+    "edges": [
+        ("user", "axelar_node_cr"),
+        ("axelar_node_cr", "operator"),
+        ("operator", "deployment"),
+        ("operator", "service"),
+        ("operator", "pvc"),
+        ("operator", "configmap"),
+    ],
+}
+
+def _render_cluster(spec, path, nodes):
+    """Create the nodes at cluster ``path``, then recurse into its sub-clusters"""
+    from diagrams import Cluster
+
+    children = []
+    for key, node_type, label, node_path in spec["nodes"]:
+        if node_path == path:
+            module = importlib.import_module(NODE_TYPES[node_type])
+            nodes[key] = getattr(module, node_type)(label)
+        elif node_path[:len(path)] == path and node_path[len(path)] not in children:
+            children.append(node_path[len(path)])
+
+    for child in children:
+        with Cluster(child):
+            _render_cluster(spec, path + (child,), nodes)
+
+def render_diagram(spec):
+    """Render ``spec`` to PNG, reusing the cached image if the spec is unchanged.
+
+    Graphviz layout dominates the runtime, so the output is keyed on a hash
+    of the spec and only regenerated when a node or edge changes.
+    """
+    output = spec["filename"] + ".png"
+    digest = hashlib.sha256(repr(spec).encode()).hexdigest()
+    cached = os.path.join(CACHE_DIR, digest + ".png")
+
+    # Ensure diagrams directory exists
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+
+    if os.path.exists(cached):
+        shutil.copyfile(cached, output)
+        return False
+
+    from diagrams import Diagram
+
+    with Diagram(spec["name"],
+                 filename=spec["filename"],
+                 show=False,
+                 direction=spec["direction"]):
+        nodes = {}
+        _render_cluster(spec, (), nodes)
+        for src, dst in spec["edges"]:
+            nodes[src] >> nodes[dst]
+
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    shutil.copyfile(output, cached)
+    return True
+
+def generate_architecture_diagram():
+    """Generate the main architecture diagram"""
+
+    return render_diagram(ARCHITECTURE_DIAGRAM)
+
+def generate_operator_workflow_diagram():
+    """Generate operator workflow diagram"""
+
+    return render_diagram(OPERATOR_WORKFLOW_DIAGRAM)
+
+def _run(generate):
+    """Process pool entry point; returns whether the diagram was re-rendered"""
+    return generate()
 
 if __name__ == "__main__":
     print("Generating Axelar Kubernetes architecture diagrams...")
-    
+
+    jobs = [
+        (generate_architecture_diagram, "Main architecture diagram"),
+        (generate_operator_workflow_diagram, "Operator workflow diagram"),
+    ]
+
     try:
-        generate_architecture_diagram()
-        print("✅ Main architecture diagram generated")
-        
-        generate_operator_workflow_diagram()
-        print("✅ Operator workflow diagram generated")
-        
+        # The diagrams are independent and each mostly waits on Graphviz,
+        # so render them side by side.
+        with ProcessPoolExecutor(max_workers=len(jobs)) as executor:
+            results = executor.map(_run, [generate for generate, _ in jobs])
+            for (_, title), rendered in zip(jobs, results):
+                print(f"✅ {title} {'generated' if rendered else 'unchanged (cached)'}")
+
         print("📁 Diagrams saved to diagrams/ directory")
-        
+
     except Exception as e:
         print(f"❌ Error generating diagrams: {e}")
         exit(1)